@@ -12,7 +12,7 @@ Notes:
 
 from typing import List, Dict, Any
 
-from .preprocessing import clean_html, split_into_sentences, normalize_text
+from .preprocessing import clean_html, normalize_text, split_normalized
 import re
 
 
@@ -47,7 +47,8 @@ def extract_fragments(
     # (it lowercases and replaces entities). We'll use the normalized text as the
     # base for offsets and returned fragment text to ensure consistency.
     plain_norm = normalize_text(plain)
-    sentences = split_into_sentences(plain_norm, max_chars=max_length)
+    # plain_norm is already normalized — split without a second normalize_text pass
+    sentences = split_normalized(plain_norm, max_chars=max_length)
     plain_lower = plain_norm  # already normalized and lowercased
 
     fragments: List[Dict[str, Any]] = []
@@ -21,6 +21,7 @@ from __future__ import annotations
 import json
 import re
 import unicodedata
+from functools import lru_cache
 from typing import List, Dict, Any, Union, Iterable
 from pathlib import Path
 
@@ -52,7 +53,18 @@ def load_keywords_from_json(path: str) -> List[Dict[str, Any]]:
                     f"Nie znaleziono pliku keywords.json pod '{path}'. Przeszukano także: '{module_kw}' i '{repo_try}'."
                 )
 
-    with open(p, 'r', encoding='utf-8') as fh:
+    # cache kluczowany ścieżką + mtime: zmiana pliku automatycznie unieważnia wpis
+    entries = _load_keywords_cached(str(p), p.stat().st_mtime_ns)
+    return [{'keyword': kw, 'weight': wt} for kw, wt in entries]
+
+
+@lru_cache(maxsize=4)
+def _load_keywords_cached(path: str, mtime_ns: int) -> tuple:
+    """Parsuje plik keywords.json do krotki (keyword, weight).
+
+    `mtime_ns` jest częścią klucza cache — nie jest używany w treści funkcji.
+    """
+    with open(path, 'r', encoding='utf-8') as fh:
         data = json.load(fh)
     # Minimalna walidacja
     out = []
@@ -67,8 +79,8 @@ def load_keywords_from_json(path: str) -> List[Dict[str, Any]]:
             wt = float(wt)
         except Exception:
             wt = 1.0
-        out.append({'keyword': str(kw), 'weight': wt})
-    return out
+        out.append((str(kw), wt))
+    return tuple(out)
 
 
 def _ensure_keywords(keywords: Union[str, Iterable[Dict[str, Any]]]) -> List[Dict[str, Any]]:
@@ -81,6 +93,32 @@ def _ensure_keywords(keywords: Union[str, Iterable[Dict[str, Any]]]) -> List[Dic
     return [ {'keyword': str(it['keyword']), 'weight': float(it.get('weight', 1.0))} for it in keywords ]
 
 
+def _normalize_text(s: str) -> str:
+    """Lowercase + usunięcie znaków diakrytycznych (NFKD) — wspólne dla słów i tekstu."""
+    s = str(s).lower()
+    if s.isascii():
+        # NFKD nie zmienia ASCII i nie ma w nim znaków łączących
+        return s
+    s = unicodedata.normalize('NFKD', s)
+    # remove diacritic marks
+    s = ''.join(ch for ch in s if not unicodedata.combining(ch))
+    return s
+
+
+def _keyword_prefixes(keywords: List[Dict[str, Any]]) -> set:
+    """Zwraca zbiór 2-znakowych prefiksów znormalizowanych słów kluczowych.
+
+    Służy jako tani pre-filtr: jeśli żaden prefiks nie występuje w tekście,
+    żaden pattern nie może się dopasować i można pominąć regexy.
+    """
+    prefixes = set()
+    for k in keywords:
+        norm_kw = _normalize_text(k['keyword'].strip())
+        if norm_kw:
+            prefixes.add(norm_kw[:2])
+    return prefixes
+
+
 def _compile_keyword_patterns(keywords: List[Dict[str, Any]]):
     """Zwraca listę tupli (keyword, weight, compiled_pattern).
 
@@ -92,14 +130,10 @@ def _compile_keyword_patterns(keywords: List[Dict[str, Any]]):
         if not keyword:
             continue
         # prepare normalized keyword (lowercase, remove diacritics) for more robust matching
-        def _normalize(s: str) -> str:
-            s = str(s).lower()
-            s = unicodedata.normalize('NFKD', s)
-            # remove diacritic marks
-            s = ''.join(ch for ch in s if not unicodedata.combining(ch))
-            return s
-
-        norm_kw = _normalize(keyword)
+        norm_kw = _normalize_text(keyword)
+        if not norm_kw:
+            # np. sam znak łączący — pusty po normalizacji, pattern dopasowałby pusty ciąg
+            continue
         # allow a limited set of common Polish inflectional suffixes (avoid matching derivational forms
         # like '-owy' which are not true inflections). This reduces false positives such as 'kryzysowy'.
         suffixes = [
@@ -117,21 +151,78 @@ def match_keywords_in_text(text: str, keywords: Union[str, Iterable[Dict[str, An
     Dopasowanie jest case-insensitive i token-boundary.
     """
     kw_list = _ensure_keywords(keywords)
-    patterns = _compile_keyword_patterns(kw_list)
+    patterns, matcher, prefixes = _prepare_matcher(tuple((k['keyword'], k['weight']) for k in kw_list))
     # normalize input text for matching (lowercase + remove diacritics)
-    def _normalize_text(s: str) -> str:
-        s = str(s).lower()
-        s = unicodedata.normalize('NFKD', s)
-        s = ''.join(ch for ch in s if not unicodedata.combining(ch))
-        return s
     text_norm = _normalize_text(text or '')
-    counts: Dict[str, int] = {}
-    for keyword, _, pattern in patterns:
-        matches = pattern.findall(text_norm)
-        cnt = len(matches)
-        if cnt:
-            counts[keyword] = cnt
-    return counts
+    _, matches = _score_text(text_norm, patterns, matcher, prefixes)
+    return {m['keyword']: m['count'] for m in matches}
+
+
+def _build_matcher(compiled) -> tuple:
+    """Buduje (combined_pattern, by_first_char) dla listy z `_compile_keyword_patterns`.
+
+    `combined_pattern` to jedna alternacja wszystkich patternów opakowana w
+    lookahead — jeden przebieg po tekście wskazuje wszystkie pozycje, na których
+    zaczyna się jakiekolwiek słowo kluczowe (także nakładające się, np. 'karta'
+    wewnątrz 'nie działa karta'). `by_first_char` mapuje pierwszy znak
+    znormalizowanego słowa na listę (index, pattern) do weryfikacji na tej pozycji.
+    """
+    by_first_char: Dict[str, list] = {}
+    for idx, (keyword, _, pattern) in enumerate(compiled):
+        norm_kw = _normalize_text(keyword)
+        if norm_kw:
+            by_first_char.setdefault(norm_kw[0], []).append((idx, pattern))
+    if not compiled:
+        return None, by_first_char
+    combined = re.compile(
+        r'(?=(?:' + '|'.join(pattern.pattern for _, _, pattern in compiled) + r'))',
+        flags=re.IGNORECASE | re.UNICODE,
+    )
+    return combined, by_first_char
+
+
+@lru_cache(maxsize=8)
+def _prepare_matcher(kw_items: tuple) -> tuple:
+    """Zwraca (compiled, matcher, prefixes) dla krotki par (keyword, weight).
+
+    `score_segments` jest wołane raz na wypowiedź z tą samą listą słów —
+    kompilacja patternów i alternacji odbywa się raz na zestaw słów kluczowych,
+    a nie przy każdym wywołaniu.
+    """
+    kw_list = [{'keyword': kw, 'weight': wt} for kw, wt in kw_items]
+    compiled = _compile_keyword_patterns(kw_list)
+    return compiled, _build_matcher(compiled), _keyword_prefixes(kw_list)
+
+
+def _score_text(text_norm: str, compiled, matcher: tuple, prefixes: set) -> tuple:
+    """Zwraca (score, matches) dla już znormalizowanego tekstu."""
+    # pre-filtr: bez żadnego prefiksu słowa kluczowego regexy nic nie znajdą
+    if not any(p in text_norm for p in prefixes):
+        return 0.0, []
+    combined, by_first_char = matcher
+    counts: Dict[int, int] = {}
+    # koniec ostatniego dopasowania danego słowa — zachowuje semantykę findall
+    # (dopasowania tego samego słowa nie nakładają się)
+    last_end: Dict[int, int] = {}
+    for m in combined.finditer(text_norm):
+        pos = m.start()
+        for idx, pattern in by_first_char.get(text_norm[pos], ()):
+            if pos < last_end.get(idx, 0):
+                continue
+            hit = pattern.match(text_norm, pos)
+            if hit:
+                counts[idx] = counts.get(idx, 0) + 1
+                last_end[idx] = hit.end()
+
+    total = 0.0
+    matches_list: List[Dict[str, Any]] = []
+    # kolejność jak w liście słów kluczowych
+    for idx in sorted(counts):
+        keyword, weight, _ = compiled[idx]
+        cnt = counts[idx]
+        total += cnt * float(weight)
+        matches_list.append({'keyword': keyword, 'count': cnt, 'weight': float(weight)})
+    return float(total), matches_list
 
 
 def score_segments(segments: List[Union[str, Dict[str, Any]]], keywords: Union[str, Iterable[Dict[str, Any]]]) -> List[Dict[str, Any]]:
@@ -143,15 +234,12 @@ def score_segments(segments: List[Union[str, Dict[str, Any]]], keywords: Union[s
     Wyniki są posortowane malejąco po `score`.
     """
     kw_list = _ensure_keywords(keywords)
-    compiled = _compile_keyword_patterns(kw_list)
-    # normalize function for segment texts
-    def _normalize_text(s: str) -> str:
-        s = str(s).lower()
-        s = unicodedata.normalize('NFKD', s)
-        s = ''.join(ch for ch in s if not unicodedata.combining(ch))
-        return s
+    compiled, matcher, prefixes = _prepare_matcher(tuple((k['keyword'], k['weight']) for k in kw_list))
 
     results: List[Dict[str, Any]] = []
+    # stenogramy zawierają dużo powtarzalnych formułek — identyczne teksty
+    # liczymy tylko raz w obrębie wywołania (cache jest związany z `compiled`)
+    cache: Dict[str, tuple] = {}
     for seg in segments:
         # obsłużemy zarówno string jak i dict z polem 'text'
         if isinstance(seg, str):
@@ -162,16 +250,13 @@ def score_segments(segments: List[Union[str, Dict[str, Any]]], keywords: Union[s
         else:
             text = str(seg)
 
-        total = 0.0
-        matches_list: List[Dict[str, Any]] = []
-        text_norm = _normalize_text(text or '')
-        for keyword, weight, pattern in compiled:
-            cnt = len(pattern.findall(text_norm))
-            if cnt:
-                total += cnt * float(weight)
-                matches_list.append({'keyword': keyword, 'count': cnt, 'weight': float(weight)})
+        text = text or ''
+        cached = cache.get(text)
+        if cached is None:
+            cached = cache[text] = _score_text(_normalize_text(text), compiled, matcher, prefixes)
+        total, matches_list = cached
 
-        results.append({'segment': seg, 'score': float(total), 'matches': matches_list})
+        results.append({'segment': seg, 'score': total, 'matches': list(matches_list)})
 
     # sort descending by score
     results.sort(key=lambda x: x['score'], reverse=True)
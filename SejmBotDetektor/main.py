@@ -4,12 +4,156 @@ AI-powered humor detection.
 """
 
 import argparse
+import os
+from functools import lru_cache, partial
+from operator import itemgetter
 from pathlib import Path
 from typing import Optional, Sequence
 
 from SejmBotDetektor.config import get_detector_settings
+from SejmBotDetektor import preprocessing
+from SejmBotDetektor import keyword_scoring
+from SejmBotDetektor import fragment_extraction
+from SejmBotDetektor import serializers
 
+try:
+    # orjson (opcjonalny) parsuje stenogramy kilkukrotnie szybciej niż stdlib json
+    import orjson as _json
+except ImportError:
+    import json as _json
 
+_PACKAGE_DIR = Path(__file__).resolve().parent
+_REPO_ROOT = _PACKAGE_DIR.parent
+# Fallback: katalogi z wynikami Scrapera
+_CANDIDATE_DATA_DIRS = (_REPO_ROOT / 'data_sejm', _REPO_ROOT / 'data')
+_FIXTURE_PATH = _PACKAGE_DIR / 'fixtures' / 'transcript_sample.json'
+_KEYWORDS_PATH = _PACKAGE_DIR / 'keywords' / 'keywords.json'
+# Poniżej tej łącznej wielkości plików pula procesów się nie opłaca — na
+# platformach ze spawn (Windows) każdy worker importuje pakiet od nowa
+_POOL_MIN_BYTES = 1 << 20
+
+
+class InputFileError(Exception):
+    """Pliku wejściowego nie da się wczytać albo nie zawiera listy wypowiedzi."""
+
+
+def _file_size(path: Path) -> int:
+    try:
+        return path.stat().st_size
+    except OSError:
+        return 0
+
+
+def _read_bytes(path: Path) -> bytes:
+    with open(path, 'rb') as fh:
+        return fh.read()
+
+
+def _iter_json_files(root: str):
+    """Zwraca ścieżki (str) plików *.json pod `root`, z pominięciem wyników detektora.
+
+    Zastępuje `rglob('*.json')`: wpisy z os.scandir filtrujemy po nazwie, bez
+    budowania obiektu Path dla każdego pliku. Katalogi zawierające 'detector'
+    w nazwie są pomijane w całości (tak jak filtr po ścieżce względnej), a
+    dowiązania do katalogów nie są odwiedzane — jak w rglob.
+    """
+    stack = [root]
+    while stack:
+        current = stack.pop()
+        try:
+            with os.scandir(current) as entries:
+                for entry in entries:
+                    name = entry.name
+                    if 'detector' in name.lower():
+                        continue
+                    if entry.is_dir(follow_symlinks=False):
+                        stack.append(entry.path)
+                    elif name.endswith('.json'):
+                        yield entry.path
+        except OSError:
+            # brak uprawnień, katalog usunięty w trakcie skanowania itp. — jak rglob
+            continue
+
+
+def _extract_file(file_p: Path, keywords: list, max_statements: int):
+    """Wczytuje plik i wyciąga z niego fragmenty (część CPU pipeline'u).
+
+    Zwraca (n_statements, n_processed, fragments); rzuca InputFileError, gdy
+    pliku nie da się wczytać lub nie rozpoznano w nim listy wypowiedzi.
+    Funkcja jest na poziomie modułu, żeby dało się ją wysłać do puli procesów.
+    """
+    try:
+        data = _json.loads(_read_bytes(file_p))
+    except (OSError, ValueError) as e:
+        raise InputFileError(f'Nie można wczytać pliku {file_p}: {e}') from None
+
+    # Najczęstszy przypadek ({'statements': [...]}) sprawdzamy jako pierwszy
+    raw = data.get('statements') if isinstance(data, dict) else data
+    if isinstance(raw, list):
+        statements = raw
+    elif isinstance(raw, dict) and isinstance(raw.get('statements'), list):
+        statements = raw['statements']
+    else:
+        raise InputFileError(f'Nie rozpoznano listy wypowiedzi w pliku {file_p}')
+
+    stmts_to_process = statements[:max_statements]
+
+    all_fragments = []
+    # Stenogramy powtarzają formułki proceduralne i puste wypowiedzi — identyczny
+    # tekst przetwarzamy raz na plik, a przy powtórzeniu kopiujemy fragmenty
+    # z identyfikatorem bieżącej wypowiedzi.
+    by_text = {}
+    for stmt in stmts_to_process:
+        text = stmt.get('text') or stmt.get('segment') or ''
+        statement = {'text': text, 'num': stmt.get('num')}
+        cached = by_text.get(text)
+        if cached is None:
+            segments = preprocessing.clean_normalize_split(text, max_chars=500)
+
+            scored = keyword_scoring.score_segments(segments, keywords)
+            fragments = by_text[text] = fragment_extraction.extract_fragments(scored, statement)
+        else:
+            stmt_id = fragment_extraction._get_statement_id(statement)
+            fragments = [dict(f, statement_id=stmt_id) for f in cached]
+
+        if fragments:
+            all_fragments.extend(fragments)
+
+    # Sort fragments by score (extract_fragments always sets 'score').
+    # A full sort is kept: all fragments are written to the results, not only top_n.
+    all_fragments.sort(key=itemgetter('score'), reverse=True)
+
+    return len(statements), len(stmts_to_process), all_fragments
+
+
+def _extract_files(paths: Sequence[Path], keywords: list, max_statements: int, parallel: bool = True):
+    """Zwraca kolejno (ścieżka, load) w kolejności `paths`.
+
+    `load()` zwraca wynik _extract_file dla danego pliku albo rzuca
+    InputFileError. Pliki są od siebie niezależne, więc przy `parallel` i co
+    najmniej dwóch plikach o łącznej wielkości >= _POOL_MIN_BYTES parsowanie,
+    scoring i ekstrakcja idą do puli procesów (po jednym pliku na zadanie).
+    W przeciwnym razie plik jest przetwarzany dopiero przy wywołaniu `load()`.
+    Ocena AI i zapis wyników zostają w procesie głównym.
+    """
+    workers = min(len(paths), os.cpu_count() or 1) if parallel else 1
+    if workers > 1 and sum(_file_size(p) for p in paths) < _POOL_MIN_BYTES:
+        workers = 1
+    if workers <= 1:
+        for path in paths:
+            yield path, partial(_extract_file, path, keywords, max_statements)
+        return
+    # import dopiero tutaj: multiprocessing kosztuje ~20 ms startu, a --help,
+    # --version i małe wejścia go nie potrzebują
+    from concurrent.futures import ProcessPoolExecutor
+
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        futures = [pool.submit(_extract_file, path, keywords, max_statements) for path in paths]
+        for path, future in zip(paths, futures):
+            yield path, future.result
+
+
+@lru_cache(maxsize=1)
 def create_parser():
     parser = argparse.ArgumentParser(
         description='SejmBotDetektor — wykrywanie i ocena humoru w stenogramach',
@@ -20,6 +164,8 @@ def create_parser():
     parser.add_argument('--output-dir', type=str, help='Katalog do zapisu wyników')
     parser.add_argument('--max-statements', type=int, help='Maksymalna liczba wypowiedzi do przetworzenia')
     parser.add_argument('--test-mode', action='store_true', help='Tryb testowy — ograniczone zachowanie')
+    parser.add_argument('--quiet', action='store_true',
+                        help='Nie wypisuj diagnostyki (tylko ostrzeżenia, błędy i ścieżki wyników)')
 
     # NEW: AI evaluation flags
     parser.add_argument('--ai-evaluate', action='store_true',
@@ -52,18 +198,24 @@ def main(argv: Optional[Sequence[str]] = None) -> int:
     ai_provider = args.ai_provider
     ai_min_score = args.ai_min_score
     top_n = args.top_n
+    verbose = not args.quiet
+
+    def diag(msg: str, *fmt_args) -> None:
+        """Wypisuje diagnostykę; %-formatowanie wykonywane tylko gdy verbose."""
+        if verbose:
+            print(msg % fmt_args if fmt_args else msg)
 
     # Setup
-    print('SejmBotDetektor — uruchamiam pipeline detektora')
+    diag('SejmBotDetektor — uruchamiam pipeline detektora')
     if ai_evaluate:
-        print('🤖 AI evaluation ENABLED')
-        print(f'   Provider: {ai_provider}')
-        print(f'   Min score: {ai_min_score}')
-        print(f'   Top N: {top_n}')
+        diag('🤖 AI evaluation ENABLED')
+        diag('   Provider: %s', ai_provider)
+        diag('   Min score: %s', ai_min_score)
+        diag('   Top N: %s', top_n)
 
-    print(f'  input_dir:  {input_dir}')
-    print(f'  output_dir: {output_dir}')
-    print(f'  max_statements: {max_statements}')
+    diag('  input_dir:  %s', input_dir)
+    diag('  output_dir: %s', output_dir)
+    diag('  max_statements: %s', max_statements)
 
     try:
         output_dir.mkdir(parents=True, exist_ok=True)
@@ -73,22 +225,16 @@ def main(argv: Optional[Sequence[str]] = None) -> int:
 
     # Run pipeline
     def _run_pipeline(use_test_fixture: bool = False) -> None:
-        import json
-        from SejmBotDetektor import preprocessing
-        from SejmBotDetektor import keyword_scoring
-        from SejmBotDetektor import fragment_extraction
-        from SejmBotDetektor import serializers
-
         # NEW: Initialize AI evaluator if requested
         ai_evaluator = None
         if ai_evaluate:
             try:
                 from SejmBotDetektor.ai_evaluator import AIEvaluator
-                print('🤖 Inicjalizacja AI evaluator...')
+                diag('🤖 Inicjalizacja AI evaluator...')
 
                 config = {'primary_api': ai_provider} if ai_provider != 'auto' else {}
                 ai_evaluator = AIEvaluator(config)
-                print(f'✓ AI evaluator ready (cache: {len(ai_evaluator.cache)} entries)')
+                diag('✓ AI evaluator ready (cache: %d entries)', len(ai_evaluator.cache))
             except ImportError as e:
                 from SejmBotDetektor import ai_evaluator as _ai_mod
                 AIEvaluator = None  # zapewnia istnienie symbolu w tej gałęzi
@@ -100,95 +246,84 @@ def main(argv: Optional[Sequence[str]] = None) -> int:
                 ai_evaluator = None  # wyłącz AI, kontynuuj bez oceny AI
 
         input_paths = []
-        if not use_test_fixture and input_dir and input_dir.exists() and input_dir.is_dir():
-            json_files = list(input_dir.glob('*.json'))
-            input_paths.extend(json_files)
+        if not use_test_fixture and input_dir and input_dir.is_dir():  # is_dir() is False for missing paths
+            # scandir: typ wpisu pochodzi z readdir, bez osobnego stat na plik
+            with os.scandir(input_dir) as entries:
+                input_paths.extend(
+                    Path(e.path) for e in entries
+                    if e.name.endswith('.json') and e.is_file()
+                )
 
         if not input_paths:
             # Fallback: search for Scraper output
-            repo_root = Path(__file__).resolve().parents[1]
-            candidate_dirs = [repo_root / 'data_sejm', repo_root / 'data']
             found = []
-            for cd in candidate_dirs:
-                if cd.exists() and cd.is_dir():
-                    found.extend([p for p in cd.rglob('*.json') if 'detector' not in str(p).lower()])
-            found = sorted(found)
+            for cd in _CANDIDATE_DATA_DIRS:
+                if not cd.is_dir():
+                    continue
+                # filtr 'detector' dotyczy tylko ścieżki wewnątrz katalogu danych,
+                # nie położenia samego repozytorium
+                found.extend(Path(p) for p in _iter_json_files(str(cd)))
+            # kolejność jak wcześniej przy rglob: sortowanie obiektów Path
+            found.sort()
             if found:
                 input_paths.extend(found)
             else:
                 # Use fixture
-                fixture_path = Path(__file__).parent / 'fixtures' / 'transcript_sample.json'
-                if fixture_path.exists():
-                    input_paths.append(fixture_path)
+                if _FIXTURE_PATH.exists():
+                    input_paths.append(_FIXTURE_PATH)
                 else:
                     print('Brak plików wejściowych. Kończę.')
                     return
 
         # Load keywords
-        kws_path = Path(__file__).parent / 'keywords' / 'keywords.json'
         try:
-            keywords = keyword_scoring.load_keywords_from_json(str(kws_path))
+            keywords = keyword_scoring.load_keywords_from_json(str(_KEYWORDS_PATH))
         except Exception:
-            print(f'Nie można wczytać słów kluczowych z {kws_path}')
+            print(f'Nie można wczytać słów kluczowych z {_KEYWORDS_PATH}')
             keywords = [{'keyword': 'humor', 'weight': 1.0}, {'keyword': 'żart', 'weight': 2.0}]
 
+        if not use_test_fixture:
+            # Largest files first: they take the longest, so the pool starts on them
+            # while the smaller ones fill the remaining workers. Test mode stops after
+            # the first loaded file (in path order), so it skips this sort and the pool.
+            input_paths.sort(key=lambda p: (-_file_size(p), str(p)))
+
         # Process files
-        for file_p in input_paths:
+        for file_p, load in _extract_files(input_paths, keywords, max_statements,
+                                           parallel=not use_test_fixture):
             try:
-                with open(file_p, 'r', encoding='utf-8') as fh:
-                    data = json.load(fh)
-            except (OSError, json.JSONDecodeError) as e:
-                print(f'Nie można wczytać pliku {file_p}: {e}')
-                continue
-
-            statements = data.get('statements') or data
-            if isinstance(statements, dict) and 'statements' in statements:
-                statements = statements.get('statements', [])
-            if not isinstance(statements, list):
-                print(f'Nie rozpoznano listy wypowiedzi w pliku {file_p}')
+                n_statements, n_processed, all_fragments = load()
+            except InputFileError as e:
+                print(e)
                 continue
 
-            stmts_to_process = statements[:max_statements]
-
-            all_fragments = []
-            for stmt in stmts_to_process:
-                text = stmt.get('text') or stmt.get('segment') or ''
-                cleaned = preprocessing.clean_html(text)
-                normalized = preprocessing.normalize_text(cleaned)
-                segments = preprocessing.split_into_sentences(normalized, max_chars=500)
-
-                scored = keyword_scoring.score_segments([{'text': s} for s in segments], keywords)
-                fragments = fragment_extraction.extract_fragments(scored, {'text': text, 'num': stmt.get('num')})
-
-                if fragments:
-                    all_fragments.extend(fragments)
-
-            # Sort fragments by score
-            all_fragments.sort(key=lambda x: x.get('score', 0), reverse=True)
-
-            print(f'\n📊 Znaleziono {len(all_fragments)} fragmentów')
+            diag('\n📊 Znaleziono %d fragmentów', len(all_fragments))
 
             # NEW: AI evaluation
             if ai_evaluate and ai_evaluator and all_fragments:
-                print(f'\n🤖 URUCHAMIAM AI EVALUATION')
-                print(f'   Filtr: score >= {ai_min_score}')
-                print(f'   Limit: top {top_n} fragmentów')
+                diag('\n🤖 URUCHAMIAM AI EVALUATION')
+                diag('   Filtr: score >= %s', ai_min_score)
+                diag('   Limit: top %d fragmentów', top_n)
 
-                # Filter and limit
-                fragments_for_ai = [
-                    f for f in all_fragments
-                    if f.get('score', 0) >= ai_min_score
-                ][:top_n]
+                # Filter and limit — all_fragments is sorted by score descending,
+                # so stop at the first fragment below the threshold or at top_n
+                fragments_for_ai = []
+                for f in all_fragments:
+                    if f.get('score', 0) < ai_min_score or len(fragments_for_ai) >= top_n:
+                        break
+                    fragments_for_ai.append(f)
 
-                print(f'   Do oceny: {len(fragments_for_ai)} fragmentów')
+                diag('   Do oceny: %d fragmentów', len(fragments_for_ai))
 
                 if fragments_for_ai:
                     # Evaluate with AI
                     evaluated_fragments = ai_evaluator.evaluate_fragments_batch(fragments_for_ai)
 
-                    # Replace with evaluated versions
+                    # Replace with evaluated versions (fragments_for_ai holds the very same
+                    # dicts as all_fragments, so identity is enough — no deep dict compare)
+                    ai_ids = {id(f) for f in fragments_for_ai}
                     all_fragments = evaluated_fragments + [
-                        f for f in all_fragments if f not in fragments_for_ai
+                        f for f in all_fragments if id(f) not in ai_ids
                     ]
 
                     # Stats
@@ -196,14 +331,15 @@ def main(argv: Optional[Sequence[str]] = None) -> int:
                         1 for f in evaluated_fragments
                         if f.get('ai_evaluation', {}).get('is_funny')
                     )
-                    print(f'\n✨ WYNIKI AI:')
-                    print(f'   Śmieszne: {funny_count}/{len(evaluated_fragments)}')
-                    print(f'   Cache hit rate: {ai_evaluator.get_stats()["cache_size"]}/{len(evaluated_fragments)}')
+                    diag('\n✨ WYNIKI AI:')
+                    diag('   Śmieszne: %d/%d', funny_count, len(evaluated_fragments))
+                    # len(cache) == get_stats()['cache_size'], bez budowania całego słownika statystyk
+                    diag('   Cache hit rate: %d/%d', len(ai_evaluator.cache), len(evaluated_fragments))
 
             results = {
                 'source_file': str(file_p),
-                'n_statements': len(statements),
-                'n_processed': len(stmts_to_process),
+                'n_statements': n_statements,
+                'n_processed': n_processed,
                 'n_fragments': len(all_fragments),
                 'fragments': all_fragments,
             }
@@ -223,10 +359,10 @@ def main(argv: Optional[Sequence[str]] = None) -> int:
 
     try:
         if test_mode:
-            print('\nTRYB TESTOWY: uruchamiam pipeline detektora (diagnostyka)')
+            diag('\nTRYB TESTOWY: uruchamiam pipeline detektora (diagnostyka)')
             _run_pipeline(use_test_fixture=True)
         else:
-            print('\nUruchamiam pipeline detektora (normalny tryb)')
+            diag('\nUruchamiam pipeline detektora (normalny tryb)')
             _run_pipeline(use_test_fixture=False)
     except Exception as e:
         print(f'Błąd podczas uruchamiania pipeline detektora: {e}')
@@ -7,6 +7,8 @@ Funkcje:
 - normalize_text(text) -> str
 - clean_html(html) -> str
 - split_into_sentences(text, max_chars=500) -> List[str]
+- clean_normalize_split(html_content, max_chars=500) -> List[str]
+- split_normalized(text, max_chars=500) -> List[str]
 """
 
 from typing import List
@@ -14,6 +16,17 @@ import re
 import html
 
 
+_WHITESPACE_RE = re.compile(r'\s+')
+_SCRIPT_RE = re.compile(r'<script[^>]*>.*?</script>', flags=re.DOTALL | re.IGNORECASE)
+_STYLE_RE = re.compile(r'<style[^>]*>.*?</style>', flags=re.DOTALL | re.IGNORECASE)
+_BR_RE = re.compile(r'<br\s*/?>', flags=re.IGNORECASE)
+# fix: properly close the character class for h1-h6 and include li, ul, ol
+_BLOCK_END_RE = re.compile(r'</(p|div|h[1-6]|li|ul|ol)[^>]*>', flags=re.IGNORECASE)
+_TAG_RE = re.compile(r'<[^>]+>')
+_SENTENCE_END_RE = re.compile(r'(?<=[\.\!\?])\s+')
+_COMMA_RE = re.compile(r',\s+')
+
+
 def normalize_text(text: str) -> str:
     """Normalize text for downstream processing.
 
@@ -42,7 +55,7 @@ def normalize_text(text: str) -> str:
 
     # Normalize whitespace
     t = t.strip()
-    t = re.sub(r"\s+", " ", t)
+    t = _WHITESPACE_RE.sub(" ", t)
 
     # Lowercase (preserve Polish diacritics)
     t = t.lower()
@@ -64,20 +77,19 @@ def clean_html(html_content: str) -> str:
         return ''
 
     # Remove script/style blocks
-    text = re.sub(r'<script[^>]*>.*?</script>', ' ', html_content, flags=re.DOTALL | re.IGNORECASE)
-    text = re.sub(r'<style[^>]*>.*?</style>', ' ', text, flags=re.DOTALL | re.IGNORECASE)
+    text = _SCRIPT_RE.sub(' ', html_content)
+    text = _STYLE_RE.sub(' ', text)
 
     # Replace <br> and block tags with newlines
-    text = re.sub(r'<br\s*/?>', '\n', text, flags=re.IGNORECASE)
-    # fix: properly close the character class for h1-h6 and include li, ul, ol
-    text = re.sub(r'</(p|div|h[1-6]|li|ul|ol)[^>]*>', '\n', text, flags=re.IGNORECASE)
+    text = _BR_RE.sub('\n', text)
+    text = _BLOCK_END_RE.sub('\n', text)
 
     # Strip all tags
-    text = re.sub(r'<[^>]+>', ' ', text)
+    text = _TAG_RE.sub(' ', text)
 
     # Unescape HTML entities and normalize whitespace
     text = html.unescape(text)
-    text = re.sub(r'\s+', ' ', text).strip()
+    text = _WHITESPACE_RE.sub(' ', text).strip()
 
     return text
 
@@ -99,10 +111,39 @@ def split_into_sentences(text: str, max_chars: int = 500) -> List[str]:
     if not text:
         return []
 
-    t = normalize_text(text)
+    return split_normalized(normalize_text(text), max_chars)
+
+
+def clean_normalize_split(html_content: str, max_chars: int = 500) -> List[str]:
+    """Fused clean_html -> normalize_text -> split_into_sentences.
+
+    Equivalent to calling the three functions in sequence, but the text is
+    normalized only once (split_into_sentences would normalize it again).
+
+    Args:
+        html_content: raw statement text (may contain HTML)
+        max_chars: maximum characters per segment
+
+    Returns:
+        List of segments
+    """
+    if not html_content:
+        return []
+
+    return split_normalized(normalize_text(clean_html(html_content)), max_chars)
+
+
+def split_normalized(t: str, max_chars: int = 500) -> List[str]:
+    """Sentence splitting for text that already went through normalize_text.
+
+    Same result as split_into_sentences(t, max_chars), without normalizing
+    the text a second time.
+    """
+    if not t:
+        return []
 
     # Basic sentence split (keep delimiters)
-    parts = re.split(r'(?<=[\.\!\?])\s+', t)
+    parts = _SENTENCE_END_RE.split(t)
 
     segments: List[str] = []
 
@@ -116,7 +157,7 @@ def split_into_sentences(text: str, max_chars: int = 500) -> List[str]:
             continue
 
         # If too long, try to split by commas
-        subparts = re.split(r',\s+', part)
+        subparts = _COMMA_RE.split(part)
         buffer = ''
         for sp in subparts:
             if not buffer:
@@ -5,9 +5,16 @@ Obsługa formatów JSON, CSV i innych
 
 import json
 import logging
+import os
 from pathlib import Path
 from typing import Optional, Dict, Any, Union
 
+try:
+    # orjson (opcjonalny) serializuje kilkukrotnie szybciej niż stdlib json
+    import orjson
+except ImportError:
+    orjson = None
+
 logger = logging.getLogger(__name__)
 
 
@@ -37,8 +44,17 @@ class DataSerializersImpl:
             # Upewnij się że katalog istnieje
             filepath.parent.mkdir(parents=True, exist_ok=True)
 
-            with open(filepath, 'w', encoding='utf-8') as f:
-                json.dump(data, f, ensure_ascii=ensure_ascii, indent=indent, default=self._json_serializer)
+            payload = self._dumps(data, indent, ensure_ascii)
+
+            # Zapis atomowy: najpierw plik tymczasowy, potem os.replace — czytelnicy
+            # nigdy nie zobaczą częściowo zapisanego pliku po przerwanym eksporcie
+            tmp_path = filepath.with_name(filepath.name + '.tmp')
+            try:
+                tmp_path.write_bytes(payload)
+                os.replace(tmp_path, filepath)
+            finally:
+                if tmp_path.exists():
+                    tmp_path.unlink()
 
             logger.debug(f"Zapisano JSON: {filepath}")
             return True
@@ -74,6 +90,33 @@ class DataSerializersImpl:
             logger.error(f"Błąd ładowania JSON {filepath}: {e}")
             return None
 
+    def _dumps(self, data: Any, indent: Optional[int], ensure_ascii: bool) -> bytes:
+        """
+        Serializuje dane do bajtów UTF-8
+
+        Używa orjson, jeśli jest zainstalowany i obsługuje żądany format
+        (wcięcie 2 lub brak, bez wymuszania ASCII); w przeciwnym razie stdlib json.
+
+        Dataclassy i datetime orjson przekazuje do `_json_serializer`, więc wynik
+        jest taki sam jak ze stdlib json. Różnice, których orjson nie pozwala
+        wyłączyć: zwykły Enum zapisywany jest jako jego wartość (stdlib:
+        str(obj), np. "LogLevel.INFO"), a NaN/Infinity jako null (stdlib: NaN).
+        """
+        if orjson is not None and not ensure_ascii and indent in (None, 2):
+            option = (orjson.OPT_NON_STR_KEYS
+                      | orjson.OPT_PASSTHROUGH_DATACLASS
+                      | orjson.OPT_PASSTHROUGH_DATETIME)
+            if indent:
+                option |= orjson.OPT_INDENT_2
+            try:
+                return orjson.dumps(data, default=self._json_serializer, option=option)
+            except orjson.JSONEncodeError:
+                # np. liczby całkowite > 64 bit — stdlib json poradzi sobie z nimi
+                pass
+
+        return json.dumps(data, ensure_ascii=ensure_ascii, indent=indent,
+                          default=self._json_serializer).encode('utf-8')
+
     def _json_serializer(self, obj):
         """
         Niestandardowy serializer dla obiektów JSON
@@ -68,3 +68,71 @@ def test_loader_ignores_malformed_entries(tmp_path):
     kws = ks.load_keywords_from_json(str(p))
     assert len(kws) == 1
     assert kws[0]['keyword'] == 'ok'
+
+
+def test_prefilter_skips_segments_without_keyword_prefixes():
+    keywords = [{'keyword': 'żart', 'weight': 2.0}]
+    segments = ['Zupełnie inny temat.', 'To był żart!']
+    scored = ks.score_segments(segments, keywords)
+    assert scored[0]['segment'] == 'To był żart!'
+    assert scored[0]['score'] == 2.0
+    assert scored[1] == {'segment': 'Zupełnie inny temat.', 'score': 0.0, 'matches': []}
+
+
+def test_repeated_segments_are_scored_consistently():
+    keywords = [{'keyword': 'inflacja', 'weight': 1.5}]
+    segments = ['Inflacja rośnie.', {'text': 'Inflacja rośnie.'}, 'Inflacja rośnie.']
+    scored = ks.score_segments(segments, keywords)
+    assert [s['score'] for s in scored] == [1.5, 1.5, 1.5]
+    # each result gets its own matches list
+    assert scored[0]['matches'] is not scored[2]['matches']
+    assert [s['segment'] for s in scored] == segments
+
+
+def test_loader_cache_is_invalidated_when_file_changes(tmp_path):
+    import os
+
+    p = tmp_path / 'kw.json'
+    p.write_text(json.dumps([{'keyword': 'pierwsze', 'weight': 1.0}]), encoding='utf-8')
+    first = ks.load_keywords_from_json(str(p))
+    # mutating the returned list must not leak into the cache
+    first[0]['weight'] = 99.0
+    assert ks.load_keywords_from_json(str(p))[0]['weight'] == 1.0
+
+    p.write_text(json.dumps([{'keyword': 'drugie', 'weight': 2.0}]), encoding='utf-8')
+    st = p.stat()
+    os.utime(p, ns=(st.st_atime_ns, st.st_mtime_ns + 1_000_000_000))
+    assert ks.load_keywords_from_json(str(p)) == [{'keyword': 'drugie', 'weight': 2.0}]
+
+
+def test_overlapping_keywords_are_counted_independently():
+    keywords = [
+        {'keyword': 'karta', 'weight': 1.0},
+        {'keyword': 'nie działa karta', 'weight': 3.0},
+        {'keyword': 'ha, ha', 'weight': 0.5},
+    ]
+    text = 'Nie działa karta! Znowu karta. Ha, ha, ha.'
+    counts = ks.match_keywords_in_text(text, keywords)
+    assert counts == {'karta': 2, 'nie działa karta': 1, 'ha, ha': 1}
+
+    scored = ks.score_segments([text], keywords)
+    assert scored[0]['score'] == 2 * 1.0 + 3.0 + 0.5
+    # matches keep the order of the keywords list
+    assert [m['keyword'] for m in scored[0]['matches']] == ['karta', 'nie działa karta', 'ha, ha']
+
+
+def test_matcher_is_reused_per_keyword_set_and_respects_weights():
+    ks._prepare_matcher.cache_clear()
+    kws = [{'keyword': 'humor', 'weight': 1.0}]
+    ks.score_segments(['humor'], kws)
+    ks.score_segments(['znowu humor'], kws)
+    assert ks._prepare_matcher.cache_info().hits == 1
+
+    heavier = [{'keyword': 'humor', 'weight': 4.0}]
+    assert ks.score_segments(['humor'], heavier)[0]['score'] == 4.0
+
+
+def test_keyword_empty_after_normalization_is_ignored():
+    kws = [{'keyword': 'humor', 'weight': 1.0}, {'keyword': '\u0301', 'weight': 1.0}]
+    assert ks.match_keywords_in_text('dobry humor', kws) == {'humor': 1}
+    assert ks.score_segments(['dobry humor'], kws)[0]['score'] == 1.0
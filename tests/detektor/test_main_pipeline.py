@@ -0,0 +1,147 @@
+import sys
+from pathlib import Path
+
+REPO_ROOT = Path(__file__).resolve().parents[2]
+sys.path.insert(0, str(REPO_ROOT))
+
+import json
+
+import pytest
+
+from SejmBotDetektor import main as detector_main
+
+KEYWORDS = [{'keyword': 'humor', 'weight': 1.0}, {'keyword': 'żart', 'weight': 2.0}]
+
+
+def _write(path: Path, payload) -> Path:
+    path.write_text(json.dumps(payload, ensure_ascii=False), encoding='utf-8')
+    return path
+
+
+def _transcripts(tmp_path):
+    paths = []
+    for i in range(3):
+        paths.append(_write(tmp_path / f't{i}.json', {'statements': [
+            {'num': 1, 'text': f'Pan poseł {i} ma poczucie humoru.'},
+            {'num': 2, 'text': 'To był dobry żart. Humor dopisuje.'},
+        ]}))
+    return paths
+
+
+def _run(paths, **kwargs):
+    out = []
+    for path, load in detector_main._extract_files(paths, KEYWORDS, 100, **kwargs):
+        try:
+            out.append((path, load()))
+        except detector_main.InputFileError as e:
+            out.append((path, str(e)))
+    return out
+
+
+def test_extract_files_serial_path(tmp_path):
+    paths = _transcripts(tmp_path)
+    results = _run(paths)
+
+    assert [p for p, _ in results] == paths
+    for path, (n_statements, n_processed, fragments) in results:
+        assert (n_statements, n_processed) == (2, 2)
+        assert fragments == detector_main._extract_file(path, KEYWORDS, 100)[2]
+
+
+def test_extract_files_pool_matches_serial(tmp_path, monkeypatch):
+    paths = _transcripts(tmp_path)
+    bad = _write(tmp_path / 'bad.json', {'x': 1})
+    paths.insert(1, bad)
+    serial = _run(paths, parallel=False)
+
+    monkeypatch.setattr(detector_main, '_POOL_MIN_BYTES', 0)
+    monkeypatch.setattr(detector_main.os, 'cpu_count', lambda: 2)
+    pooled = _run(paths)
+
+    assert pooled == serial
+    assert 'Nie rozpoznano listy wypowiedzi' in pooled[1][1]
+
+
+def test_extract_file_raises_for_unreadable_json(tmp_path):
+    broken = tmp_path / 'broken.json'
+    broken.write_text('{nie json', encoding='utf-8')
+    with pytest.raises(detector_main.InputFileError, match='Nie można wczytać pliku'):
+        detector_main._extract_file(broken, KEYWORDS, 100)
+
+
+def test_iter_json_files_matches_rglob_filter(tmp_path):
+    for rel in ['a.json', 'x/b.json', 'x/Detector/c.json', 'x/y/z.json',
+                'x/y/detector_out.json', 'x/notes.txt', 'k/l.json']:
+        p = tmp_path / rel
+        p.parent.mkdir(parents=True, exist_ok=True)
+        p.write_text('{}', encoding='utf-8')
+    try:
+        (tmp_path / 'x' / 'link').symlink_to(tmp_path / 'k', target_is_directory=True)
+    except OSError:
+        pytest.skip('symlinks not supported')
+
+    prefix_len = len(str(tmp_path))
+    expected = sorted(
+        str(p) for p in tmp_path.rglob('*.json')
+        if 'detector' not in str(p)[prefix_len:].lower()
+    )
+    found = sorted(detector_main._iter_json_files(str(tmp_path)))
+
+    assert found == expected
+    rel = {Path(p).relative_to(tmp_path).as_posix() for p in found}
+    assert rel == {'a.json', 'x/b.json', 'x/y/z.json', 'k/l.json'}
+
+
+def test_iter_json_files_tolerates_vanished_directory(tmp_path):
+    _write(tmp_path / 'a.json', {})
+    assert list(detector_main._iter_json_files(str(tmp_path / 'missing'))) == []
+
+
+@pytest.mark.parametrize('payload', [
+    'list',
+    'statements',
+    'nested',
+])
+def test_extract_file_accepts_statement_shapes(tmp_path, payload):
+    statements = [{'num': 1, 'text': 'Dobry humor na sali.'}, {'num': 2, 'text': 'Nic.'}]
+    data = {
+        'list': statements,
+        'statements': {'statements': statements},
+        'nested': {'statements': {'statements': statements}},
+    }[payload]
+    path = _write(tmp_path / 'in.json', data)
+
+    n_statements, n_processed, fragments = detector_main._extract_file(path, KEYWORDS, 100)
+
+    assert (n_statements, n_processed) == (2, 2)
+    assert any(f['matched_keywords'] for f in fragments)
+
+
+@pytest.mark.parametrize('data', [{'statements': 'abc'}, {'x': []}, 'tekst', 42])
+def test_extract_file_rejects_unknown_shape(tmp_path, data):
+    path = _write(tmp_path / 'in.json', data)
+    with pytest.raises(detector_main.InputFileError, match='Nie rozpoznano listy wypowiedzi'):
+        detector_main._extract_file(path, KEYWORDS, 100)
+
+
+def test_extract_file_reuses_fragments_for_repeated_texts(tmp_path):
+    from SejmBotDetektor import preprocessing, keyword_scoring, fragment_extraction
+
+    texts = ['Dobry humor na sali. Dalej.', '', 'To żart, a nie humor.']
+    statements = [{'num': i + 1, 'text': texts[i % len(texts)]} for i in range(9)]
+    path = _write(tmp_path / 'in.json', {'statements': statements})
+
+    _, _, fragments = detector_main._extract_file(path, KEYWORDS, 100)
+
+    expected = []
+    for stmt in statements:
+        segments = preprocessing.clean_normalize_split(stmt['text'], max_chars=500)
+        scored = keyword_scoring.score_segments(segments, KEYWORDS)
+        expected.extend(fragment_extraction.extract_fragments(scored, stmt))
+    expected.sort(key=lambda f: f['score'], reverse=True)
+
+    assert fragments == expected
+    # każde powtórzenie ma własny statement_id i osobny słownik (merge AI używa id())
+    assert len({id(f) for f in fragments}) == len(fragments)
+    ids_for_humor = sorted(f['statement_id'] for f in fragments if f['text'].startswith('dobry humor'))
+    assert ids_for_humor == [1, 4, 7]
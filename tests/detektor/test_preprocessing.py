@@ -38,3 +38,20 @@ def test_split_into_sentences_short_and_long():
     assert len(segments) >= 2
     # No segment longer than limit
     assert all(len(s) <= 80 for s in segments)
+
+
+def test_clean_normalize_split_matches_separate_stages():
+    from SejmBotDetektor.preprocessing import clean_normalize_split
+
+    raw = "<p>Pierwsze   ZDANIE &amp; coś.</p><p>Drugie zdanie, dość długie, z przecinkami!</p><br/>Trzecie?"
+    expected = split_into_sentences(normalize_text(clean_html(raw)), max_chars=30)
+    assert clean_normalize_split(raw, max_chars=30) == expected
+    assert clean_normalize_split('') == []
+
+
+def test_split_normalized_skips_renormalization():
+    from SejmBotDetektor.preprocessing import split_normalized
+
+    norm = normalize_text(clean_html("<p>Raz, DWA &amp; trzy.</p> Cztery pięć sześć siedem osiem!"))
+    assert split_normalized(norm, max_chars=20) == split_into_sentences(norm, max_chars=20)
+    assert split_normalized('') == []
@@ -22,3 +22,49 @@ def test_dump_results_writes_file(tmp_path):
     content = json.loads(p.read_text(encoding='utf-8'))
     # FileManagerInterface.save_json wraps data under metadata/data by default
     assert 'metadata' in content or 'data' in content
+
+
+def test_dump_results_leaves_no_temp_file(tmp_path):
+    from SejmBotDetektor.serializers import dump_results
+
+    out = dump_results({'fragments': []}, base_dir=str(tmp_path), filename='atomic.json')
+
+    p = Path(out)
+    assert p.exists()
+    assert not p.with_name(p.name + '.tmp').exists()
+
+
+def test_dump_results_serializes_non_json_types(tmp_path):
+    from SejmBotDetektor.serializers import dump_results
+
+    results = {'source_file': Path('a/b.json'), 'tags': {'żart'}, 1: 'int key'}
+    out = dump_results(results, base_dir=str(tmp_path), filename='types.json')
+
+    content = json.loads(Path(out).read_text(encoding='utf-8'))
+    assert content['data']['source_file'] == str(Path('a/b.json'))
+    assert content['data']['tags'] == ['żart']
+    assert content['data']['1'] == 'int key'
+
+
+def test_save_json_output_does_not_depend_on_orjson(tmp_path, monkeypatch):
+    import dataclasses
+    from datetime import datetime
+    from SejmBotScraper.storage import data_serializers
+
+    @dataclasses.dataclass
+    class Foo:
+        a: int
+
+    data = {'when': datetime(2024, 1, 2, 3, 4, 5, 6), 'foo': Foo(1), 'path': Path('x.json')}
+    serializer = data_serializers.DataSerializersImpl()
+
+    assert serializer.save_json(tmp_path / 'fast.json', data)
+    monkeypatch.setattr(data_serializers, 'orjson', None)
+    assert serializer.save_json(tmp_path / 'stdlib.json', data)
+
+    fast = json.loads((tmp_path / 'fast.json').read_text(encoding='utf-8'))
+    stdlib = json.loads((tmp_path / 'stdlib.json').read_text(encoding='utf-8'))
+    assert fast == stdlib
+    assert stdlib['when'] == '2024-01-02T03:04:05.000006'
+    assert stdlib['foo'].endswith('Foo(a=1)')
+    assert stdlib['path'] == 'x.json'